@@ -12,35 +12,113 @@ import sys
 import time
 import logging
 import csv
+import functools
+import threading
+import queue
 import ipaddress
-from typing import Optional, Tuple, List, Dict
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Tuple, List, Dict, Iterator
 import pexpect
 
 import click
-from rich.console import Console
-from rich.logging import RichHandler
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
 
+# Rich modules are imported where they are used, so --help exits without
+# loading them
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)-8s %(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=False, show_path=False)]
-)
+class _LazyConsole:
+    """Proxy for the shared Rich console, which is created on first use."""
+    
+    _console = None
+    _lock = threading.Lock()
+    
+    def get(self):
+        """Return the real Console (for APIs that need the object itself)."""
+        if _LazyConsole._console is None:
+            with _LazyConsole._lock:
+                if _LazyConsole._console is None:
+                    from rich.console import Console
+                    _LazyConsole._console = Console()
+        return _LazyConsole._console
+    
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
 
 logger = logging.getLogger("ruckus_reboot")
-console = Console()
+console = _LazyConsole()
+
+# Number of devices processed concurrently in batch mode
+DEFAULT_MAX_WORKERS = 16
+
+# New SSH connections started per second in batch mode (0 disables the limit)
+DEFAULT_CONNECT_RATE = 10.0
+
+# Seconds ssh may spend connecting (TCP connect plus SSH handshake) before giving up
+DEFAULT_CONNECT_TIMEOUT = 10
+
+# Dotted-quad IPv4 addresses (no leading zeros), validated without ipaddress
+_IPV4_OCTET = r'(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
+_IPV4_RE = re.compile(rf'\A(?:{_IPV4_OCTET}\.){{3}}{_IPV4_OCTET}\Z'.encode('ascii'))
+
+# Cheap shape check for IPv6 addresses before full validation
+_IPV6_CANDIDATE_RE = re.compile(r'\A[0-9a-fA-F:.]+(?:%\S+)?\Z')
+
+# Prompts seen while logging in; the matched group name selects the reply.
+# There is no host key prompt: StrictHostKeyChecking=accept-new never asks.
+_LOGIN_PROMPT_RE = re.compile(
+    r'(?P<login>Please login:)'
+    r'|(?P<password>[Pp]assword\s*:)'
+    r'|(?P<cli>rkscli:)'
+)
+
+# Login prompts answered before giving up (SSH password, Ruckus login and password)
+_MAX_LOGIN_PROMPTS = 3
+
+# Precompiled expect pattern lists, shared by every connection
+_CONNECT_PATTERNS = [_LOGIN_PROMPT_RE, pexpect.EOF, pexpect.TIMEOUT]
+_REBOOT_PATTERNS = [re.compile('OK'), re.compile('rkscli:'), pexpect.EOF, pexpect.TIMEOUT]
+_COMMAND_PATTERNS = [re.compile('rkscli:'), pexpect.EOF, pexpect.TIMEOUT]
+
+def _reboot_result(index: int, output: str) -> Tuple[bool, str]:
+    """Interpret the reply to 'reboot' (index into _REBOOT_PATTERNS)."""
+    if index == 0:  # OK response
+        return True, "OK"
+    return False, f"Reboot command failed: {output}"
+
+
+def _command_result(index: int, output: str) -> Tuple[bool, str]:
+    """Interpret the reply to any other command (index into _COMMAND_PATTERNS)."""
+    if index == 0:  # rkscli prompt
+        return True, output
+    return False, f"Command failed: {output}"
+
+
+# Expect patterns and result handler per command; anything else waits for the CLI prompt
+_COMMAND_TABLE = {
+    "reboot": (_REBOOT_PATTERNS, _reboot_result)
+}
+_DEFAULT_COMMAND = (_COMMAND_PATTERNS, _command_result)
+
+# Ruckus CLI queries used by get_system_info, by result key
+_SYSTEM_INFO_KEYS = ("version", "uptime")
+_SYSTEM_INFO_COMMANDS = ["get version", "get uptime"]
+_VERSION_RE = re.compile(r'^\s*(?P<model>\S.*?)\s*\n\s*Version:\s*(?P<version>.+?)\s*$', re.M)
+_UPTIME_RE = re.compile(r'Uptime:\s*(?P<uptime>.*?)\s*(?:OK|$)', re.S)
+
+# Status cell text and style for result tables, keyed by success
+_STATUS_CELLS = {True: ("Success", "green"), False: ("Failed", "red")}
 
 
 class RuckusRebootTool:
     """Main class for handling Ruckus access point reboot operations."""
     
-    def __init__(self, host: str, username: str, password: str, port: int = 22):
+    def __init__(self, host: str, username: str, password: str, port: int = 22,
+                 connect_timeout: int = DEFAULT_CONNECT_TIMEOUT):
         """
         Initialize the Ruckus reboot tool.
         
@@ -49,13 +127,37 @@ class RuckusRebootTool:
             username: SSH username
             password: SSH password
             port: SSH port (default: 22)
+            connect_timeout: Seconds ssh may spend connecting (ConnectTimeout)
         """
         self.host = host
         self.username = username
         self.password = password
         self.port = port
+        self.connect_timeout = connect_timeout
         self.child = None
+        self.connect_error: Optional[str] = None
+    
+    def __enter__(self) -> "RuckusRebootTool":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
         
+    def _ssh_args(self) -> List[str]:
+        """
+        Build ssh arguments.
+        
+        Returns:
+            List[str]: Arguments for the ssh client
+        """
+        return [
+            '-o', 'StrictHostKeyChecking=accept-new',
+            # Applied by ssh itself, so ProxyJump/ProxyCommand and host aliases still work
+            '-o', f'ConnectTimeout={self.connect_timeout}',
+            '-p', str(self.port),
+            f'{self.username}@{self.host}'
+        ]
+    
     def connect(self) -> bool:
         """
         Establish SSH connection to the Ruckus access point.
@@ -64,58 +166,67 @@ class RuckusRebootTool:
             bool: True if connection successful, False otherwise
         """
         try:
-            # Construct SSH command
-            ssh_cmd = f"ssh -p {self.port} {self.username}@{self.host}"
-            
-            # Start pexpect process
-            self.child = pexpect.spawn(ssh_cmd, timeout=30)
-            
-            # Handle different SSH prompts
-            i = self.child.expect([
-                'Please login:',
-                'password:',
-                'Password:',
-                'Are you sure you want to continue connecting',
-                pexpect.EOF,
-                pexpect.TIMEOUT
-            ])
+            # Start pexpect process (poll() instead of select(), no local echo,
+            # and expect only rescans the tail of the buffer)
+            self.child = pexpect.spawn(
+                'ssh',
+                args=self._ssh_args(),
+                timeout=30,
+                encoding='utf-8',
+                codec_errors='ignore',
+                echo=False,
+                use_poll=True,
+                maxread=4096,
+                searchwindowsize=1024
+            )
             
-            logger.debug(f"SSH prompt detected: index {i}")
+            # Answer login prompts until the Ruckus CLI prompt appears
+            replies = {
+                'login': self.username,
+                'password': self.password
+            }
+            answered = set()
             
-            if i == 0:  # Ruckus login prompt
-                self.child.sendline(self.username)
-                self.child.expect(['password :'])
-                self.child.sendline(self.password)
-            elif i == 1 or i == 2:  # Standard password prompt
-                self.child.sendline(self.password)
-            elif i == 3:  # SSH key verification
-                self.child.sendline('yes')
-                self.child.expect(['password:', 'Password:', 'Please login:'])
-                if self.child.after == b'Please login:':
-                    self.child.sendline(self.username)
-                    self.child.expect(['password :'])
-                    self.child.sendline(self.password)
-                else:
-                    self.child.sendline(self.password)
-            elif i == 4:  # EOF
-                logger.error(f"SSH connection failed to {self.host} - EOF received")
-                return False
-            elif i == 5:  # Timeout
-                logger.error(f"SSH connection to {self.host} timed out")
-                return False
+            for _ in range(_MAX_LOGIN_PROMPTS + 1):
+                i = self.child.expect_list(_CONNECT_PATTERNS)
+                
+                if i == 1:  # EOF
+                    # ssh's own error (e.g. "Connection timed out") is its last output line
+                    lines = [line.strip() for line in self.child.before.splitlines() if line.strip()]
+                    self.connect_error = lines[-1] if lines else "EOF received"
+                    # Transient failures are reported in the result, not logged as errors
+                    logger.debug("SSH connection failed to %s - %s", self.host, self.connect_error)
+                    return False
+                elif i == 2:  # Timeout
+                    self.connect_error = "timed out"
+                    logger.debug("SSH connection to %s timed out", self.host)
+                    return False
+                
+                prompt = self.child.match.lastgroup
+                logger.debug("SSH prompt detected on %s: %s", self.host, prompt)
+                
+                if prompt == 'cli':
+                    logger.info("Successfully connected to %s (Ruckus CLI)", self.host)
+                    return True
+                
+                # A prompt seen again means the credentials were rejected;
+                # never retry them (each retry is another failed auth). The
+                # SSH password comes before the Ruckus login and the Ruckus
+                # password after it, so passwords are keyed by that stage.
+                stage = (prompt, 'login' in answered) if prompt == 'password' else prompt
+                if stage in answered:
+                    break
+                answered.add(stage)
+                
+                self.child.sendline(replies[prompt])
             
-            # Wait for Ruckus CLI prompt
-            try:
-                self.child.expect('rkscli:', timeout=10)
-                logger.info(f"Successfully connected to {self.host} (Ruckus CLI)")
-                return True
-                    
-            except pexpect.TIMEOUT:
-                logger.error(f"Timeout waiting for Ruckus CLI prompt from {self.host}")
-                return False
+            self.connect_error = "login failed"
+            logger.error("Login to %s failed - check username and password", self.host)
+            return False
                     
         except Exception as e:
-            logger.error(f"Connection error to {self.host}: {str(e)}")
+            self.connect_error = str(e)
+            logger.error("Connection error to %s: %s", self.host, e)
             return False
     
     def execute_command(self, command: str, timeout: int = 30) -> Tuple[bool, str]:
@@ -135,82 +246,115 @@ class RuckusRebootTool:
         try:
             self.child.sendline(command)
             
-            # Wait for response (expect OK for reboot command)
-            if command == "reboot":
-                i = self.child.expect(['OK', 'rkscli:', pexpect.EOF, pexpect.TIMEOUT], timeout=timeout)
-                output = self.child.before.decode('utf-8', errors='ignore').strip()
+            # Wait for the command's expected response
+            patterns, handle_result = _COMMAND_TABLE.get(command, _DEFAULT_COMMAND)
+            i = self.child.expect_list(patterns, timeout=timeout)
+            return handle_result(i, self.child.before.strip())
                 
-                if i == 0:  # OK response
-                    return True, "OK"
-                else:
-                    return False, f"Reboot command failed: {output}"
-            else:
-                # For other commands, wait for CLI prompt
-                i = self.child.expect(['rkscli:', pexpect.EOF, pexpect.TIMEOUT], timeout=timeout)
-                output = self.child.before.decode('utf-8', errors='ignore').strip()
+        except Exception as e:
+            return False, f"Command execution error: {str(e)}"
+    
+    def execute_commands(self, commands: List[str], timeout: int = 30) -> List[Tuple[bool, str]]:
+        """
+        Execute several commands on the Ruckus access point in one round trip.
+        
+        All commands are sent before waiting for the first CLI prompt, then
+        one prompt is collected per command. Echoed command lines are removed
+        from the output.
+        
+        Args:
+            commands: Commands to execute, in order
+            timeout: Timeout in seconds for each command
+            
+        Returns:
+            List[Tuple[bool, str]]: (success, output) for each command
+        """
+        if not self.child:
+            return [(False, "Not connected")] * len(commands)
+        
+        results = []
+        sent = set(commands)
+        
+        try:
+            for command in commands:
+                self.child.sendline(command)
+            
+            for command in commands:
+                i = self.child.expect_list(_COMMAND_PATTERNS, timeout=timeout)
+                output = '\n'.join(
+                    line for line in self.child.before.splitlines() if line.strip() not in sent
+                ).strip()
                 
                 if i == 0:  # rkscli prompt
-                    return True, output
+                    results.append((True, output))
                 else:
-                    return False, f"Command failed: {output}"
+                    results.append((False, f"Command failed: {output}"))
+                    break
                 
         except Exception as e:
-            return False, f"Command execution error: {str(e)}"
+            results.append((False, f"Command execution error: {str(e)}"))
+        
+        # Commands left unanswered after a failure
+        results.extend([(False, "Not executed")] * (len(commands) - len(results)))
+        return results
     
-    def reboot(self, confirm: bool = True) -> bool:
+    def reboot(self, confirm: bool = True, prompt_err: bool = False) -> bool:
         """
         Reboot the Ruckus access point.
         
         Args:
             confirm: Whether to require confirmation before reboot
+            prompt_err: Write the confirmation prompt to stderr instead of stdout
             
         Returns:
             bool: True if reboot initiated successfully
         """
         if not self.child:
-            logger.error(f"Not connected to {self.host}")
+            logger.error("Not connected to %s", self.host)
             return False
         
         try:
             # For Ruckus CLI, we can proceed directly with reboot
             # The whoami command may not be available in Ruckus CLI
-            logger.info(f"Initiating reboot on {self.host}...")
-            
-            # Execute reboot command
-            logger.info(f"Initiating reboot on {self.host}...")
+            logger.info("Initiating reboot on %s...", self.host)
             
             if confirm:
-                console.print(Panel(
-                    f"[red]WARNING: This will reboot the access point at {self.host}[/red]\n"
-                    "This action will disconnect all connected devices temporarily.",
-                    title="Reboot Confirmation",
-                    border_style="red"
-                ))
+                if sys.stdout.isatty():
+                    from rich.panel import Panel
+                    
+                    console.print(Panel(
+                        f"[red]WARNING: This will reboot the access point at {self.host}[/red]\n"
+                        "This action will disconnect all connected devices temporarily.",
+                        title="Reboot Confirmation",
+                        border_style="red"
+                    ))
+                else:
+                    # Piped or scripted: plain text, no Rich rendering
+                    click.echo(
+                        f"WARNING: This will reboot the access point at {self.host}\n"
+                        "This action will disconnect all connected devices temporarily.",
+                        err=prompt_err
+                    )
                 
-                if not click.confirm("Do you want to continue?"):
-                    logger.info(f"Reboot cancelled by user for {self.host}")
+                with prompts_to_stderr(prompt_err):
+                    confirmed = click.confirm("Do you want to continue?", err=prompt_err)
+                if not confirmed:
+                    logger.info("Reboot cancelled by user for %s", self.host)
                     return False
             
-            # Try reboot command (Ruckus uses 'reboot')
-            reboot_commands = [
-                "reboot"
-            ]
-            
-            for cmd in reboot_commands:
-                            success, output = self.execute_command(cmd, timeout=60)
+            # Ruckus CLI only accepts 'reboot'
+            success, output = self.execute_command("reboot", timeout=60)
             if success:
-                logger.info(f"Reboot command '{cmd}' executed successfully on {self.host}")
-                logger.info(f"Command output: '{output}'")
-                logger.info(f"Access point {self.host} is rebooting...")
+                logger.info("Reboot command executed successfully on %s", self.host)
+                logger.info("Command output: '%s'", output)
+                logger.info("Access point %s is rebooting...", self.host)
                 return True
-            else:
-                logger.error(f"Command '{cmd}' failed on {self.host}: {output}")
             
-            logger.error(f"All reboot commands failed on {self.host}")
+            logger.error("Reboot command failed on %s: %s", self.host, output)
             return False
             
         except Exception as e:
-            logger.error(f"Reboot error on {self.host}: {str(e)}")
+            logger.error("Reboot error on %s: %s", self.host, e)
             return False
     
     def get_system_info(self) -> dict:
@@ -222,36 +366,20 @@ class RuckusRebootTool:
         """
         info = {}
         
-        commands = {
-            "version": "get version",
-            "uptime": "get uptime"
-        }
+        # Send all queries in one round trip
+        outputs = self.execute_commands(_SYSTEM_INFO_COMMANDS)
         
-        for key, cmd in commands.items():
-            success, output = self.execute_command(cmd)
-            if success:
-                # Clean up the output
-                if key == "version":
-                    # Remove "get version" command from the output first
-                    clean_output = output.replace('get version', '').strip()
-                    lines = clean_output.split('\n')
-                    if len(lines) >= 2:
-                        model = lines[0].strip()
-                        version = lines[1].replace('Version:', '').strip()
-                        info[key] = f"{model} - {version}"
-                    else:
-                        info[key] = clean_output
-                elif key == "uptime":
-                    # Extract just the uptime info
-                    if 'Uptime:' in output:
-                        uptime = output.split('Uptime:')[1].split('OK')[0].strip()
-                        info[key] = uptime
-                    else:
-                        info[key] = output.strip()
-                else:
-                    info[key] = output.strip()
-            else:
+        for key, (success, output) in zip(_SYSTEM_INFO_KEYS, outputs):
+            if not success:
                 info[key] = "Not available"
+            elif key == "version":
+                # Model line followed by "Version: x.y.z"
+                match = _VERSION_RE.search(output)
+                info[key] = f"{match['model']} - {match['version']}" if match else output
+            else:
+                # Uptime text up to the trailing "OK"
+                match = _UPTIME_RE.search(output)
+                info[key] = match['uptime'] if match else output
         
         return info
     
@@ -261,13 +389,128 @@ class RuckusRebootTool:
             try:
                 self.child.sendline("exit")
                 self.child.close()
-                logger.info(f"Disconnected from {self.host}")
+                logger.info("Disconnected from %s", self.host)
             except:
                 pass
             finally:
                 self.child = None
 
 
+class RateLimiter:
+    """Thread-safe limiter that spaces calls at least 1/rate seconds apart."""
+    
+    def __init__(self, rate_per_sec: float):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            rate_per_sec: Maximum number of acquisitions per second
+        """
+        self._min_gap = 1.0 / rate_per_sec
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until the next free slot (no sleep if calls are already slower than the rate)."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._min_gap
+        
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@contextmanager
+def queued_logging():
+    """
+    Route log records through a queue drained by a single listener thread.
+    
+    Worker threads only enqueue records; the configured handlers (and the
+    console lock behind them) are used by the listener thread alone.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    try:
+        yield
+    finally:
+        listener.stop()
+        root.handlers = handlers
+
+
+@contextmanager
+def prompts_to_stderr(enabled: bool = True):
+    """
+    Keep interactive prompts off stdout (used with --jsonl).
+    
+    click writes a space to stdout while reading input even when the prompt
+    itself goes to stderr, so stdout is redirected for the prompt's duration.
+    """
+    if not enabled:
+        yield
+        return
+    with redirect_stdout(sys.stderr):
+        yield
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_ipv6_address(ip: str) -> bool:
+    """Return True if the string is a valid IPv6 address (regex prefilter, then ipaddress)."""
+    if not _IPV6_CANDIDATE_RE.match(ip):
+        return False
+    try:
+        ipaddress.ip_address(ip)
+        return True
+    except ValueError:
+        return False
+
+
+def iter_csv_file(csv_file: str) -> Iterator[Tuple[int, str, bool]]:
+    """
+    Lazily yield the first-column entries of a CSV file.
+    
+    Only the first column is used, so lines are scanned as bytes from a
+    buffered binary file (so pipes and process substitution work too);
+    csv.reader is only used for rows with a quoted first field. LF, CRLF
+    and CR-only line endings are accepted. Empty rows, comment rows and
+    inline comments are skipped.
+    
+    Args:
+        csv_file: Path to the CSV file
+        
+    Yields:
+        Tuple[int, str, bool]: Row number, entry and whether it is a valid IP address
+    """
+    with open(csv_file, 'rb') as file:
+        # Iterating a binary file only splits on LF; splitlines() also
+        # splits CR-only rows and drops the line terminators
+        lines = (line for chunk in file for line in chunk.splitlines())
+        for row_num, line in enumerate(lines, 1):
+            if line.startswith(b'"'):
+                # Quoted field: fall back to the csv module for this row
+                row = next(csv.reader([line.decode('utf-8', errors='replace')]), None)
+                ip = row[0].encode('utf-8') if row else b''
+            else:
+                ip = line.split(b',', 1)[0]
+            # Drop inline comments, e.g. "10.0.0.1  # lobby" or "10.0.0.1" # lobby
+            ip = ip.split(b'#', 1)[0].strip()
+            if not ip:  # Skip empty rows and comments
+                continue
+            
+            # Validate IP address (only IPv6-shaped values reach ipaddress)
+            if _IPV4_RE.match(ip):
+                yield row_num, ip.decode('ascii'), True
+                continue
+            
+            ip = ip.decode('utf-8', errors='replace')
+            yield row_num, ip, _is_ipv6_address(ip)
+
+
 def read_csv_file(csv_file: str) -> List[str]:
     """
     Read IP addresses from a CSV file.
@@ -276,30 +519,33 @@ def read_csv_file(csv_file: str) -> List[str]:
         csv_file: Path to the CSV file
         
     Returns:
-        List[str]: List of valid IP addresses
+        List[str]: List of unique valid IP addresses, in file order
     """
     ip_addresses = []
     invalid_ips = []
     
     try:
-        with open(csv_file, 'r', newline='') as file:
-            reader = csv.reader(file)
-            for row_num, row in enumerate(reader, 1):
-                if row:  # Skip empty rows
-                    ip = row[0].strip()
-                    if ip and not ip.startswith('#'):  # Skip comments
-                        # Validate IP address
-                        try:
-                            ipaddress.ip_address(ip)
-                            ip_addresses.append(ip)
-                        except ValueError:
-                            invalid_ips.append((row_num, ip))
+        for row_num, ip, valid in iter_csv_file(csv_file):
+            if valid:
+                ip_addresses.append(ip)
+            else:
+                invalid_ips.append((row_num, ip))
+        
+        # Each access point is processed once, even if it is listed several times
+        unique_ips = list(dict.fromkeys(ip_addresses))
+        duplicate_count = len(ip_addresses) - len(unique_ips)
+        ip_addresses = unique_ips
         
         # Report invalid IP addresses
         if invalid_ips:
             console.print(f"[red]Warning: Found {len(invalid_ips)} invalid IP addresses in {csv_file}:[/red]")
-            for row_num, ip in invalid_ips:
-                console.print(f"[red]  Row {row_num}: '{ip}' is not a valid IP address[/red]")
+            # One write for all rows; row values are printed verbatim, not parsed as markup
+            console.print(
+                "\n".join(f"  Row {row_num}: '{ip}' is not a valid IP address" for row_num, ip in invalid_ips),
+                style="red",
+                markup=False,
+                highlight=False
+            )
             
             if not ip_addresses:
                 console.print(f"[red]Error: No valid IP addresses found in {csv_file}[/red]")
@@ -307,6 +553,9 @@ def read_csv_file(csv_file: str) -> List[str]:
             else:
                 console.print(f"[yellow]Continuing with {len(ip_addresses)} valid IP addresses...[/yellow]")
         
+        if duplicate_count:
+            console.print(f"[yellow]Skipped {duplicate_count} duplicate IP addresses in {csv_file}[/yellow]")
+        
         console.print(f"[green]Loaded {len(ip_addresses)} valid IP addresses from {csv_file}[/green]")
         return ip_addresses
         
@@ -319,109 +568,177 @@ def read_csv_file(csv_file: str) -> List[str]:
 
 
 def process_single_device(host: str, username: str, password: str, port: int, 
-                         no_confirm: bool, info: bool, no_reboot: bool = False, verbose: bool = False) -> Dict[str, str]:
+                         no_confirm: bool, info: bool, no_reboot: bool = False, verbose: bool = False,
+                         limiter: Optional["RateLimiter"] = None, jsonl: bool = False,
+                         connect_timeout: int = DEFAULT_CONNECT_TIMEOUT) -> Dict[str, str]:
     """
     Process a single device.
     
+    Args:
+        limiter: Optional rate limiter acquired before connecting
+        jsonl: Keep stdout for JSON Lines (prompts go to stderr)
+        connect_timeout: Seconds ssh may spend connecting
+    
     Returns:
         Dict[str, str]: Result information
     """
-    tool = RuckusRebootTool(host, username, password, port)
     result = {
         'host': host,
         'status': 'Failed',
         'message': 'Unknown error'
     }
     
-    try:
-        # Connect to access point
-        if not tool.connect():
-            result['message'] = 'Connection failed'
-            return result
-        
-        # Get system information if requested
-        if info:
-            sys_info = tool.get_system_info()
-            # Add system info to result for table display
-            result.update(sys_info)
-        
-        # Perform reboot (unless --no-reboot is specified)
-        if no_reboot:
-            result['status'] = 'Success'
-            result['message'] = 'System information retrieved successfully (no reboot performed)'
-        else:
-            if tool.reboot(confirm=not no_confirm):
+    with RuckusRebootTool(host, username, password, port, connect_timeout) as tool:
+        try:
+            # Connect to access point
+            if limiter:
+                limiter.acquire()
+            if not tool.connect():
+                if tool.connect_error:
+                    result['message'] = f'Connection failed ({tool.connect_error})'
+                else:
+                    result['message'] = 'Connection failed'
+                return result
+            
+            # Get system information if requested
+            if info:
+                sys_info = tool.get_system_info()
+                # Add system info to result for table display
+                result.update(sys_info)
+            
+            # Perform reboot (unless --no-reboot is specified)
+            if no_reboot:
                 result['status'] = 'Success'
-                result['message'] = 'Reboot initiated successfully'
+                result['message'] = 'System information retrieved successfully (no reboot performed)'
             else:
-                result['message'] = 'Failed to initiate reboot'
-            
-    except Exception as e:
-        result['message'] = f'Error: {str(e)}'
-    finally:
-        tool.disconnect()
+                if tool.reboot(confirm=not no_confirm, prompt_err=jsonl):
+                    result['status'] = 'Success'
+                    result['message'] = 'Reboot initiated successfully'
+                else:
+                    result['message'] = 'Failed to initiate reboot'
+                
+        except Exception as e:
+            result['message'] = f'Error: {str(e)}'
     
     return result
 
 
 def process_batch_devices(ip_addresses: List[str], username: str, password: str, 
-                         port: int, no_confirm: bool, info: bool, no_reboot: bool = False, verbose: bool = False) -> List[Dict[str, str]]:
+                         port: int, no_confirm: bool, info: bool, no_reboot: bool = False, verbose: bool = False,
+                         max_workers: int = DEFAULT_MAX_WORKERS,
+                         rate: float = DEFAULT_CONNECT_RATE, jsonl: bool = False,
+                         connect_timeout: int = DEFAULT_CONNECT_TIMEOUT) -> List[Dict[str, str]]:
     """
     Process multiple devices in batch.
     
+    Devices are processed concurrently by a thread pool, since each worker
+    spends nearly all of its time waiting on SSH I/O. The batch is confirmed
+    once up front, so per-device reboot confirmation is always skipped
+    (``no_confirm`` is accepted for compatibility and ignored).
+    New connections are started at most ``rate`` times per second (0 for
+    no limit).
+    
+    With ``jsonl`` each result is written to stdout as one JSON line as soon
+    as it completes, in completion order, and results are not kept.
+    
     Returns:
-        List[Dict[str, str]]: List of results for each device
+        List[Dict[str, str]]: List of results for each device, in input order
+        (empty when streaming JSON Lines)
     """
-    results = []
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+    
+    results: List[Optional[Dict[str, str]]] = [] if jsonl else [None] * len(ip_addresses)
+    limiter = RateLimiter(rate) if rate > 0 else None
     
     if verbose:
-        console.print(f"\n[bold blue]Processing {len(ip_addresses)} devices...[/bold blue]")
+        console.print(f"\n[bold blue]Processing {len(ip_addresses)} devices "
+                      f"({max_workers} workers)...[/bold blue]")
+    
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed}/{task.total}"),
+        console=console.get(),
+        transient=True,
+        # With --jsonl the console is on stderr; JSON lines must stay on stdout
+        redirect_stdout=not jsonl
+    )
+    
+    # Progress.stop() prints a blank line on a non-terminal console, so the
+    # display is only started on a terminal
+    with progress if console.get().is_terminal else nullcontext():
+        task = progress.add_task("Processing devices...", total=len(ip_addresses))
         
-        for i, host in enumerate(ip_addresses):
-            console.print(f"\n[bold]Processing {host} ({i+1}/{len(ip_addresses)})...[/bold]")
-            
-            result = process_single_device(host, username, password, port, no_confirm, info, no_reboot, verbose)
-            results.append(result)
-            
-            # Add delay between devices to avoid overwhelming the network
-            if i < len(ip_addresses) - 1:
-                time.sleep(2)
-    else:
-        # Simple output mode
-        for i, host in enumerate(ip_addresses):
-            if not info:  # Only show reboot progress if not getting system info
-                console.print(f"Rebooting {host}...", end="")
-            
-            result = process_single_device(host, username, password, port, no_confirm, info, no_reboot, verbose)
-            results.append(result)
-            
-            if not info:  # Only show status if not getting system info
-                if result['status'] == 'Success':
-                    console.print("OK!")
-                else:
-                    console.print(f"FAILED: {result['message']}")
+        with queued_logging(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(process_single_device, host, username, password, port,
+                                True, info, no_reboot, verbose, limiter,
+                                connect_timeout=connect_timeout): index
+                for index, host in enumerate(ip_addresses)
+            }
             
-            # Add delay between devices to avoid overwhelming the network
-            if i < len(ip_addresses) - 1:
-                time.sleep(2)
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    
+                    if jsonl:
+                        # The JSON line is the per-device report; nothing is buffered
+                        sys.stdout.write(json.dumps(result) + "\n")
+                        sys.stdout.flush()
+                        progress.advance(task)
+                        continue
+                    
+                    results[futures[future]] = result
+                    
+                    if verbose:
+                        status_style = "green" if result['status'] == 'Success' else "red"
+                        progress.console.print(
+                            f"[bold]{result['host']}[/bold]: "
+                            f"[{status_style}]{result['status']}[/{status_style}] - {result['message']}"
+                        )
+                    elif not info:  # Only show reboot status if not getting system info
+                        if result['status'] == 'Success':
+                            progress.console.print(f"Rebooting {result['host']}...OK!")
+                        else:
+                            progress.console.print(f"Rebooting {result['host']}...FAILED: {result['message']}")
+                    
+                    progress.advance(task)
+            except BaseException:
+                # Ctrl-C (or any error) must not reboot the devices still queued:
+                # the executor's shutdown would otherwise run every pending future
+                for future in futures:
+                    future.cancel()
+                raise
     
     return results
 
 
-def display_results(results: List[Dict[str, str]], verbose: bool = False, info_mode: bool = False, no_reboot: bool = False):
-    """Display results in a formatted table."""
-    if info_mode:
-        # Always show system information table when --info is used
-        table = Table(title="System Information Results")
-        table.add_column("Host", style="cyan")
-        table.add_column("Version", style="blue")
-        table.add_column("Uptime", style="green")
-        table.add_column("Status", style="yellow")
+def display_results(results: List[Dict[str, str]], verbose: bool = False, info_mode: bool = False, no_reboot: bool = False,
+                    plain: bool = False):
+    """
+    Display results in a formatted table.
+    
+    Args:
+        plain: Print --info rows tab-separated instead of as a Rich table
+    """
+    if (info_mode and not plain) or verbose:
+        from rich.table import Table
+        from rich.text import Text
         
+        # Cells are Text objects so Rich skips markup parsing; device output is shown verbatim
+        status_cells = {ok: Text(label, style=style) for ok, (label, style) in _STATUS_CELLS.items()}
+    
+    # Successes are counted while the table rows are built
+    success_count = 0
+    
+    if info_mode:
+        # Always show system information when --info is used
+        rows = []
         for result in results:
-            status_style = "green" if result['status'] == 'Success' else "red"
+            ok = result['status'] == 'Success'
+            success_count += ok
             
-            if result['status'] == 'Success':
+            if ok:
                 version = result.get('version', 'N/A')
                 uptime = result.get('uptime', 'N/A')
             else:
@@ -429,14 +746,28 @@ def display_results(results: List[Dict[str, str]], verbose: bool = False, info_m
                 version = "—"
                 uptime = "—"
             
-            table.add_row(
-                result['host'],
-                version,
-                uptime,
-                f"[{status_style}]{result['status']}[/{status_style}]"
-            )
+            rows.append((result['host'], version, uptime, ok))
         
-        console.print(table)
+        if plain:
+            # Tab-separated: host, version, uptime, status
+            for host, version, uptime, ok in rows:
+                click.echo("\t".join((host, version, uptime, _STATUS_CELLS[ok][0])))
+        else:
+            table = Table(title="System Information Results")
+            table.add_column("Host", style="cyan")
+            table.add_column("Version", style="blue")
+            table.add_column("Uptime", style="green")
+            table.add_column("Status", style="yellow")
+            
+            for host, version, uptime, ok in rows:
+                table.add_row(
+                    Text(host),
+                    Text(version),
+                    Text(uptime),
+                    status_cells[ok]
+                )
+            
+            console.print(table)
     elif verbose:
         # Reboot results table (only in verbose mode)
         table = Table(title="Reboot Results")
@@ -445,17 +776,19 @@ def display_results(results: List[Dict[str, str]], verbose: bool = False, info_m
         table.add_column("Message", style="white")
         
         for result in results:
-            status_style = "green" if result['status'] == 'Success' else "red"
+            ok = result['status'] == 'Success'
+            success_count += ok
             table.add_row(
-                result['host'],
-                f"[{status_style}]{result['status']}[/{status_style}]",
-                result['message']
+                Text(result['host']),
+                status_cells[ok],
+                Text(result['message'])
             )
         
         console.print(table)
+    else:
+        success_count = sum(1 for r in results if r['status'] == 'Success')
     
     # Summary
-    success_count = sum(1 for r in results if r['status'] == 'Success')
     total_count = len(results)
     
     if info_mode and no_reboot:
@@ -463,13 +796,48 @@ def display_results(results: List[Dict[str, str]], verbose: bool = False, info_m
         if verbose:
             console.print(f"\n[bold]Summary:[/bold] {success_count}/{total_count} devices queried successfully")
         else:
-            console.print(f"\n{success_count}/{total_count} devices queried successfully")
+            click.echo(f"\n{success_count}/{total_count} devices queried successfully")
     else:
         # Reboot mode (with or without info)
         if verbose:
             console.print(f"\n[bold]Summary:[/bold] {success_count}/{total_count} devices rebooted successfully")
         else:
-            console.print(f"\n{success_count}/{total_count} devices rebooted successfully")
+            # Plain summary line; Rich is not needed without a table
+            click.echo(f"\n{success_count}/{total_count} devices rebooted successfully")
+
+
+def setup_logging(verbose: bool = False, stream=None):
+    """
+    Configure logging (DEBUG when verbose, otherwise errors only).
+    
+    Rich rendering is only used on a terminal; when output is redirected
+    (cron, CI) a plain stream handler is used and rich.logging is never
+    imported.
+    
+    Args:
+        verbose: Enable debug logging
+        stream: Stream to log to (default: stdout)
+    """
+    level = logging.DEBUG if verbose else logging.ERROR  # Only show errors, not warnings or info
+    stream = stream or sys.stdout
+    
+    if not stream.isatty():
+        logging.basicConfig(
+            level=level,
+            format="%(asctime)s %(levelname)-8s %(message)s",
+            datefmt="[%X]",
+            stream=stream
+        )
+        return
+    
+    from rich.logging import RichHandler
+    
+    logging.basicConfig(
+        level=level,
+        format="%(message)s",  # RichHandler renders time and level itself
+        datefmt="[%X]",
+        handlers=[RichHandler(console=console.get(), rich_tracebacks=False, show_path=False, markup=False)]
+    )
 
 
 @click.command()
@@ -481,14 +849,21 @@ def display_results(results: List[Dict[str, str]], verbose: bool = False, info_m
 @click.option('--no-confirm', is_flag=True, help='Skip reboot confirmation')
 @click.option('--info', is_flag=True, help='Show system information before reboot')
 @click.option('--no-reboot', is_flag=True, help='Only show system information, do not reboot')
+@click.option('--max-workers', '--concurrency', 'max_workers', default=DEFAULT_MAX_WORKERS, type=click.IntRange(min=1),
+              help=f'Maximum number of devices processed concurrently in batch mode (default: {DEFAULT_MAX_WORKERS})')
+@click.option('--rate', '--rps', 'rate', default=DEFAULT_CONNECT_RATE, type=click.FloatRange(min=0),
+              help=f'Maximum new SSH connections per second in batch mode, 0 for no limit (default: {DEFAULT_CONNECT_RATE:g})')
+@click.option('--connect-timeout', default=DEFAULT_CONNECT_TIMEOUT, type=click.IntRange(min=1),
+              help=f'Seconds to wait for the SSH connection and handshake (default: {DEFAULT_CONNECT_TIMEOUT})')
+@click.option('--jsonl', is_flag=True, help='Write one JSON result per device to stdout as it completes, instead of a table')
 @click.option('--verbose', '-v', is_flag=True, help='Enable verbose logging')
-def main(host, csv_file, username, password, port, no_confirm, info, no_reboot, verbose):
+def main(host, csv_file, username, password, port, no_confirm, info, no_reboot, max_workers, rate, connect_timeout,
+         jsonl, verbose):
     """Ruckus Access Point Reboot Tool - Single device or batch processing"""
-    
-    if verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
-    else:
-        logging.getLogger().setLevel(logging.ERROR)  # Only show errors, not warnings or info
+    if jsonl:
+        # Keep stdout for JSON Lines only; messages, progress and logs go to stderr
+        console.get().file = sys.stderr
+    setup_logging(verbose, stream=sys.stderr if jsonl else sys.stdout)
     
     # Validate input parameters
     if not host and not csv_file:
@@ -500,15 +875,18 @@ def main(host, csv_file, username, password, port, no_confirm, info, no_reboot,
         sys.exit(1)
     
     # Get username and password if not provided
-    if not username:
-        username = click.prompt('SSH Username')
-    if not password:
-        password = click.prompt('SSH Password', hide_input=True)
+    with prompts_to_stderr(jsonl):
+        if not username:
+            username = click.prompt('SSH Username', err=jsonl)
+        if not password:
+            password = click.prompt('SSH Password', hide_input=True, err=jsonl)
     
     try:
         if host:
             # Single device mode
             if verbose:
+                from rich.panel import Panel
+                
                 console.print(Panel(
                     f"[bold blue]Single Device Mode[/bold blue]\n"
                     f"Host: {host}\n"
@@ -518,17 +896,26 @@ def main(host, csv_file, username, password, port, no_confirm, info, no_reboot,
                     border_style="blue"
                 ))
             
-            result = process_single_device(host, username, password, port, no_confirm, info, no_reboot, verbose)
-            display_results([result], verbose, info_mode=info, no_reboot=no_reboot)
+            result = process_single_device(host, username, password, port, no_confirm, info, no_reboot, verbose,
+                                           jsonl=jsonl, connect_timeout=connect_timeout)
+            if jsonl:
+                click.echo(json.dumps(result))
+            else:
+                # Piped or scripted single-device runs get plain text instead of Rich
+                display_results([result], verbose, info_mode=info, no_reboot=no_reboot,
+                                plain=not verbose and not sys.stdout.isatty())
             
         else:
             # Batch mode
             if verbose:
+                from rich.panel import Panel
+                
                 console.print(Panel(
                     f"[bold blue]Batch Processing Mode[/bold blue]\n"
                     f"CSV File: {csv_file}\n"
                     f"Username: {username}\n"
-                    f"Port: {port}",
+                    f"Port: {port}\n"
+                    f"Workers: {max_workers}",
                     title="Batch Reboot Operation",
                     border_style="blue"
                 ))
@@ -541,6 +928,8 @@ def main(host, csv_file, username, password, port, no_confirm, info, no_reboot,
             # Confirm batch operation (only if actually rebooting)
             if not no_confirm and not no_reboot:
                 if verbose:
+                    from rich.panel import Panel
+                    
                     console.print(Panel(
                         f"[red]WARNING: This will reboot {len(ip_addresses)} access points[/red]\n"
                         "This action will disconnect all connected devices temporarily.",
@@ -550,12 +939,17 @@ def main(host, csv_file, username, password, port, no_confirm, info, no_reboot,
                 else:
                     console.print(f"About to reboot {len(ip_addresses)} access points...")
                 
-                if not click.confirm("Do you want to continue?"):
+                with prompts_to_stderr(jsonl):
+                    confirmed = click.confirm("Do you want to continue?", err=jsonl)
+                if not confirmed:
                     console.print("[yellow]Batch operation cancelled by user[/yellow]")
                     sys.exit(0)
             
-            results = process_batch_devices(ip_addresses, username, password, port, no_confirm, info, no_reboot, verbose)
-            display_results(results, verbose, info_mode=info, no_reboot=no_reboot)
+            results = process_batch_devices(ip_addresses, username, password, port, no_confirm, info, no_reboot, verbose,
+                                            max_workers=max_workers, rate=rate, jsonl=jsonl,
+                                            connect_timeout=connect_timeout)
+            if not jsonl:
+                display_results(results, verbose, info_mode=info, no_reboot=no_reboot)
             
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled by user[/yellow]")